@@ -0,0 +1,186 @@
+import os
+import math
+import configparser
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from PowerMonitor import POWER_AC, POWER_BATTERY
+
+CONFIG_NAME = "thinkfan-ui"
+CONFIG_FILE = "config.ini"
+
+FAN_LEVELS = ["auto", "full-speed", "disengaged"] + [str(i) for i in range(8)]
+
+MIN_INTERVAL = 100
+MAX_INTERVAL = 60000
+MAX_TIMEOUT = 10
+
+# the fan file gets chown'd through pkexec, so it must stay in the thinkpad_acpi tree
+FAN_FILE_DIR = "/proc/acpi/ibm/"
+
+DEFAULT_CONFIG = {
+    "sensors": {
+        "chip": "thinkpad-isa-0000",
+        # only show temperatures whose label contains one of these
+        "keywords": "cpu, gpu",
+        "timeout": "2",
+        "fan_file": "/proc/acpi/ibm/fan"
+    },
+    # poll interval in ms per power source
+    "intervals": {
+        POWER_AC: "1000",
+        POWER_BATTERY: "5000"
+    },
+    # fan level applied when switching to a power source, empty keeps the current one
+    "fan": {
+        POWER_AC: "",
+        POWER_BATTERY: ""
+    },
+    "display": {
+        "highlight": "Fan1",
+        "highlight_color": "#87CEEB"
+    },
+    "tooltips": {
+        "Tctl": "Control Temperature: Used by the CPU to manage cooling.",
+        "Tdie": "Die Temperature: The actual measured temperature of the CPU die.",
+        "Composite": "SSD Composite Temperature: Main temperature reading for the NVMe drive.",
+        # Generic catch-all for motherboard sensors
+        "temp": "Motherboard Sensor: A generic sensor for the chipset, VRMs, or case.",
+        "fan": "Fan Speed in Revolutions Per Minute (RPM).",
+        "level": "Current power level setting for the fan (0-7)."
+    }
+}
+
+
+class Config(QObject):
+    """Settings from $XDG_CONFIG_HOME/thinkfan-ui/config.ini.
+
+    The file is parsed once and then only again when QFileSystemWatcher reports
+    a change. Missing options fall back to DEFAULT_CONFIG, an invalid file is
+    reported and the previous values are kept.
+    """
+
+    onChanged = pyqtSignal()
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+
+        configHome = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+        self.configHome = configHome
+        self.configDir = os.path.join(configHome, CONFIG_NAME)
+        self.path = os.path.join(self.configDir, CONFIG_FILE)
+
+        self.fileStat = None
+
+        self.watcher = QFileSystemWatcher(self)
+        # editors usually replace the file, which drops the file watch,
+        # so the directory is watched as well
+        self.watcher.fileChanged.connect(self.onFileChanged)
+        self.watcher.directoryChanged.connect(self.onFileChanged)
+
+        self.apply(self.parse(readConfigFile(None)))
+        self.reload()
+
+    def updateWatches(self):
+        # only fall back to the whole config home until our own directory exists
+        if os.path.isdir(self.configDir):
+            paths = (self.configDir, self.path)
+            if self.configHome in self.watcher.directories():
+                self.watcher.removePath(self.configHome)
+        else:
+            paths = (self.configHome,)
+
+        watched = self.watcher.files() + self.watcher.directories()
+        for path in paths:
+            if os.path.exists(path) and path not in watched:
+                self.watcher.addPath(path)
+
+    def onFileChanged(self, path: str):
+        if self.reload():
+            self.onChanged.emit()
+
+    def reload(self) -> bool:
+        """Re-parses the config file if it changed since the last read,
+        returns True if new values were applied."""
+        self.updateWatches()
+
+        try:
+            st = os.stat(self.path)
+            fileStat = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            fileStat = None
+
+        if fileStat == self.fileStat:
+            return False
+        self.fileStat = fileStat
+
+        try:
+            values = self.parse(readConfigFile(self.path if fileStat else None))
+        except (configparser.Error, ValueError, OSError) as e:
+            print(f"Invalid config {self.path}, keeping previous values:", e)
+            return False
+
+        print("loaded config:", self.path if fileStat else "defaults")
+        self.apply(values)
+        return True
+
+    def parse(self, parser: configparser.ConfigParser) -> dict:
+        values = {}
+
+        sensors = parser["sensors"]
+        values["chip"] = sensors["chip"].strip()
+        values["keywords"] = [k.strip().lower() for k in sensors["keywords"].split(",") if k.strip()]
+        values["timeout"] = sensors.getfloat("timeout")
+        values["fanPath"] = os.path.normpath(sensors["fan_file"].strip())
+
+        if not values["chip"]:
+            raise ValueError("sensors.chip must not be empty")
+        if not values["keywords"]:
+            raise ValueError("sensors.keywords must not be empty")
+        if not math.isfinite(values["timeout"]) or not 0 < values["timeout"] <= MAX_TIMEOUT:
+            raise ValueError(f"sensors.timeout must be between 0 and {MAX_TIMEOUT} s")
+        if not values["fanPath"].startswith(FAN_FILE_DIR):
+            raise ValueError(f"sensors.fan_file must be inside {FAN_FILE_DIR}")
+
+        values["profiles"] = {}
+        for source in (POWER_AC, POWER_BATTERY):
+            interval = parser["intervals"].getint(source)
+            if not MIN_INTERVAL <= interval <= MAX_INTERVAL:
+                raise ValueError(f"intervals.{source} must be between {MIN_INTERVAL} and {MAX_INTERVAL} ms")
+
+            level = parser["fan"][source].strip().lower() or None
+            if level is not None and level not in FAN_LEVELS:
+                raise ValueError(f"fan.{source} must be empty or one of: {', '.join(FAN_LEVELS)}")
+
+            values["profiles"][source] = {"interval": interval, "level": level}
+
+        values["highlight"] = parser["display"]["highlight"].strip()
+        values["highlightColor"] = parser["display"]["highlight_color"].strip()
+        values["tooltips"] = dict(parser["tooltips"])
+
+        # ends up in a stylesheet, so only accept an actual color
+        if not QColor.isValidColorName(values["highlightColor"]):
+            raise ValueError("display.highlight_color is not a valid color")
+
+        return values
+
+    def apply(self, values: dict):
+        self.chip: str = values["chip"]
+        self.keywords: list = values["keywords"]
+        self.timeout: float = values["timeout"]
+        self.fanPath: str = values["fanPath"]
+        self.profiles: dict = values["profiles"]
+        self.highlight: str = values["highlight"]
+        self.highlightColor: str = values["highlightColor"]
+        self.tooltips: dict = values["tooltips"]
+
+
+def readConfigFile(path: str = None) -> configparser.ConfigParser:
+    # interpolation is off so values can contain a plain "%"
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_dict(DEFAULT_CONFIG)
+    if path:
+        with open(path, "r") as f:
+            parser.read_file(f)
+    return parser
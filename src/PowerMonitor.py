@@ -0,0 +1,137 @@
+import os
+import socket
+
+from PyQt6.QtCore import QObject, QSocketNotifier, pyqtSignal, pyqtSlot
+
+try:
+    from PyQt6.QtDBus import QDBusConnection
+except ImportError:
+    QDBusConnection = None
+
+POWER_SUPPLY_PATH = "/sys/class/power_supply"
+
+POWER_AC = "ac"
+POWER_BATTERY = "battery"
+
+LOGIND_SERVICE = "org.freedesktop.login1"
+LOGIND_PATH = "/org/freedesktop/login1"
+LOGIND_INTERFACE = "org.freedesktop.login1.Manager"
+
+UEVENT_GROUP = 1
+UEVENT_BUFFER = 16384
+
+
+class PowerMonitor(QObject):
+    """Reports suspend/resume and AC/battery changes without polling.
+
+    Power supply changes and hotplug come in as kernel uevents over netlink,
+    suspend/resume comes from the logind PrepareForSleep signal. Both are
+    optional, if one of them is not available a message is printed and it
+    is skipped.
+    """
+
+    onSuspend = pyqtSignal()
+    onResume = pyqtSignal()
+    onPowerSourceChanged = pyqtSignal(str)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+
+        self.powerSource = readPowerSource()
+
+        self.ueventSocket: socket.socket = None
+        self.ueventNotifier: QSocketNotifier = None
+
+        self.setupUevents()
+        self.setupLogind()
+
+    def setupUevents(self):
+        try:
+            self.ueventSocket = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_DGRAM, socket.NETLINK_KOBJECT_UEVENT)
+            self.ueventSocket.bind((0, UEVENT_GROUP))
+            self.ueventSocket.setblocking(False)
+        except (AttributeError, OSError) as e:
+            print("uevent monitoring not available:", e)
+            self.ueventSocket = None
+            return
+
+        self.ueventNotifier = QSocketNotifier(
+            self.ueventSocket.fileno(), QSocketNotifier.Type.Read, self)
+        self.ueventNotifier.activated.connect(self.onUevent)
+
+    def setupLogind(self):
+        if QDBusConnection is None:
+            print("QtDBus not available, suspend/resume will not be detected")
+            return
+
+        bus = QDBusConnection.systemBus()
+        if not bus.isConnected() or not bus.connect(
+                LOGIND_SERVICE, LOGIND_PATH, LOGIND_INTERFACE,
+                "PrepareForSleep", self.onPrepareForSleep):
+            print("failed to connect to logind, suspend/resume will not be detected")
+
+    def onUevent(self):
+        powerSupplyEvent = False
+        while True:
+            try:
+                data = self.ueventSocket.recv(UEVENT_BUFFER)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                # e.g. ENOBUFS when events got dropped, just re-read the state
+                print("uevent read failed:", e)
+                powerSupplyEvent = True
+                break
+
+            if b"SUBSYSTEM=power_supply" in data.split(b"\0"):
+                powerSupplyEvent = True
+
+        if powerSupplyEvent:
+            self.refreshPowerSource()
+
+    @pyqtSlot(bool)
+    def onPrepareForSleep(self, goingToSleep: bool):
+        if goingToSleep:
+            self.onSuspend.emit()
+        else:
+            # AC might have been (un)plugged while we were asleep
+            self.refreshPowerSource()
+            self.onResume.emit()
+
+    def refreshPowerSource(self):
+        source = readPowerSource()
+        if source != self.powerSource:
+            self.powerSource = source
+            self.onPowerSourceChanged.emit(source)
+
+    def close(self):
+        if self.ueventNotifier:
+            self.ueventNotifier.setEnabled(False)
+        if self.ueventSocket:
+            self.ueventSocket.close()
+
+
+def readPowerSource() -> str:
+    """Returns POWER_BATTERY if there is a mains supply and none of them are
+    online, POWER_AC otherwise (also on machines without any mains supply)."""
+    try:
+        supplies = os.listdir(POWER_SUPPLY_PATH)
+    except OSError:
+        return POWER_AC
+
+    hasMains = False
+    for supply in supplies:
+        base = os.path.join(POWER_SUPPLY_PATH, supply)
+        try:
+            with open(os.path.join(base, "type"), "r") as f:
+                if f.read().strip() != "Mains":
+                    continue
+            hasMains = True
+            with open(os.path.join(base, "online"), "r") as f:
+                if f.read().strip() == "1":
+                    return POWER_AC
+        except OSError:
+            continue
+
+    return POWER_BATTERY if hasMains else POWER_AC
@@ -21,6 +21,8 @@ from PyQt6.QtWidgets import (
 from ui.gui import Ui_MainWindow
 from ui.systray import QApp_SysTrayIndicator
 from QSingleApplication import QSingleApplicationTCP
+from PowerMonitor import PowerMonitor
+from Config import Config
 
 APP_NAME = "ThinkFan UI"
 APP_VERSION = "1.0.2"
@@ -29,19 +31,6 @@ APP_UUID = "587dedfb-19f2-4b2a-bc74-3d656e80966a"
 
 GITHUB_URL = "https://github.com/zocker-160/thinkfan-ui"
 
-PROC_FAN = "/proc/acpi/ibm/fan"
-
-# --- Tooltips for sensors ---
-SENSOR_TOOLTIPS = {
-    "Tctl": "Control Temperature: Used by the CPU to manage cooling.",
-    "Tdie": "Die Temperature: The actual measured temperature of the CPU die.",
-    "Composite": "SSD Composite Temperature: Main temperature reading for the NVMe drive.",
-    # Generic catch-all for motherboard sensors
-    "temp": "Motherboard Sensor: A generic sensor for the chipset, VRMs, or case.",
-    "fan": "Fan Speed in Revolutions Per Minute (RPM).",
-    "level": "Current power level setting for the fan (0-7)."
-}
-
 class ThinkFanUI(QApp_SysTrayIndicator):
 
     def __init__(self, app: QSingleApplicationTCP, argv):
@@ -53,16 +42,37 @@ class ThinkFanUI(QApp_SysTrayIndicator):
         self.app.setApplicationDisplayName(APP_NAME)
         self.app.setDesktopFileName(APP_DESKTOP_NAME)
 
+        self.fanLevel = "auto"
+        self.profileLevel = None
+        self.suspended = False
+
+        self.config = Config(self)
+        self.config.onChanged.connect(self.onConfigChanged)
+
+        self.powerMonitor = PowerMonitor(self)
+        self.powerMonitor.onSuspend.connect(self.onSuspend)
+        self.powerMonitor.onResume.connect(self.onResume)
+        self.powerMonitor.onPowerSourceChanged.connect(self.onPowerSourceChanged)
+        self.app.aboutToQuit.connect(self.powerMonitor.close)
+
+        # started and stopped by the main window, nothing to update while it is hidden
+        self.updateTimer = QTimer(self)
+        self.updateTimer.timeout.connect(self.updateUI)
+
         self.mainWindow = MainWindow(self)
         self.mainWindow.center()
-        self.mainWindow._set_fan_mode_auto()
+        if self.currentProfile()["level"] is None:
+            self.mainWindow._set_fan_mode_auto()
+        else:
+            self.applyProfileLevel()
         self.app.onActivate.connect(self.mainWindow.appear)
 
         self.useIndicator = "--no-tray" not in argv
         self.hideWindow = "--hide" in argv
 
-        if not checkPermissions():
-            updatePermissions()
+        self.fanPath = self.config.fanPath
+        if not checkPermissions(self.fanPath):
+            updatePermissions(self.fanPath)
 
         if self.useIndicator:
             self.setupSysTrayIndicator()
@@ -70,11 +80,60 @@ class ThinkFanUI(QApp_SysTrayIndicator):
         if not self.hideWindow or not self.useIndicator:
             self.mainWindow.appear()
 
-        self.updateTimer = QTimer(self)
-        self.updateTimer.timeout.connect(self.updateUI)
-        self.updateTimer.start(1000)
+    def currentProfile(self) -> dict:
+        return self.config.profiles[self.powerMonitor.powerSource]
+
+    def applyInterval(self):
+        # setInterval only restarts a running timer, updates that are paused
+        # because of suspend or a hidden window stay paused
+        self.updateTimer.setInterval(self.currentProfile()["interval"])
+
+    def applyProfileLevel(self):
+        level = self.currentProfile()["level"]
+        self.profileLevel = level
+        if level is not None:
+            self.setFanSpeed(level)
+            self.mainWindow.showFanLevel(level)
+
+    def startUpdates(self):
+        if self.suspended:
+            return
+        self.updateTimer.start(self.currentProfile()["interval"])
         self.updateTimer.timeout.emit()
 
+    def stopUpdates(self):
+        self.updateTimer.stop()
+
+    def onConfigChanged(self):
+        self.applyInterval()
+        if self.currentProfile()["level"] != self.profileLevel:
+            self.applyProfileLevel()
+        if self.config.fanPath != self.fanPath:
+            self.fanPath = self.config.fanPath
+            # no pkexec here, setFanSpeed asks for permissions on the next write
+            if not checkPermissions(self.fanPath):
+                print(f"{self.fanPath} is not writable yet")
+        if self.updateTimer.isActive():
+            self.updateTimer.timeout.emit()
+
+    def onSuspend(self):
+        print("suspending, pausing updates")
+        self.suspended = True
+        self.updateTimer.stop()
+
+    def onResume(self):
+        print("resumed, re-applying level:", self.fanLevel)
+        self.suspended = False
+        # the firmware may have reset the fan level while we were asleep
+        self.setFanSpeed(self.fanLevel)
+        if self.mainWindow.isVisible():
+            self.startUpdates()
+
+    def onPowerSourceChanged(self, source: str):
+        print("power source changed:", source)
+        self.applyInterval()
+        self.applyProfileLevel()
+
     def updateUI(self):
         # This function now ONLY updates the main window, not the tray.
         if self.mainWindow.isVisible():
@@ -105,6 +164,7 @@ class ThinkFanUI(QApp_SysTrayIndicator):
         palette = self.app.palette()
         base_color = palette.color(QPalette.ColorRole.Base).name()
         alternate_color = palette.color(QPalette.ColorRole.AlternateBase).name()
+        tooltips = self.config.tooltips
         
         for label_text, value_text in sorted(data.items()):
             label = QLabel(f"{label_text}:")
@@ -114,15 +174,15 @@ class ThinkFanUI(QApp_SysTrayIndicator):
             tooltip_key = label_text.lower()
             tooltip_text = "No additional information available."
             if "temp" in tooltip_key:
-                tooltip_text = SENSOR_TOOLTIPS.get("temp")
-            elif tooltip_key in SENSOR_TOOLTIPS:
-                 tooltip_text = SENSOR_TOOLTIPS.get(tooltip_key)
+                tooltip_text = tooltips.get("temp", tooltip_text)
+            elif tooltip_key in tooltips:
+                 tooltip_text = tooltips.get(tooltip_key)
             elif is_fan_info and 'speed' in tooltip_key:
-                 tooltip_text = SENSOR_TOOLTIPS.get("fan")
+                 tooltip_text = tooltips.get("fan", tooltip_text)
 
-            # Highlight the Fan1 row
-            if label_text == "Fan1":
-                highlight_style = "font-weight: bold; color: #87CEEB;" # Light blue color
+            # Highlight the primary fan row
+            if label_text == self.config.highlight:
+                highlight_style = f"font-weight: bold; color: {self.config.highlightColor};"
                 label.setStyleSheet(highlight_style)
                 value.setStyleSheet(highlight_style)
                 tooltip_text = "This is the primary fan controlled by this application."
@@ -157,11 +217,11 @@ class ThinkFanUI(QApp_SysTrayIndicator):
     def getTempInfo(self):
         """Reads and parses CPU and GPU temperatures from the 'sensors' command."""
         temps = {}
-        # Filter for only CPU and GPU temperatures
-        allowed_keywords = ["cpu", "gpu"]
+        # Filter for only the configured temperatures (CPU and GPU by default)
+        allowed_keywords = self.config.keywords
         try:
-            proc = subprocess.Popen(["sensors", "thinkpad-isa-0000"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            sOut, sErr = proc.communicate(timeout=2)
+            proc = subprocess.Popen(["sensors", self.config.chip], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            sOut, sErr = proc.communicate(timeout=self.config.timeout)
 
             if not sErr:
                 lines = sOut.decode().strip().split("\n")
@@ -191,7 +251,7 @@ class ThinkFanUI(QApp_SysTrayIndicator):
         
         # 1. Get status and level from /proc/acpi/ibm/fan
         try:
-            with open(PROC_FAN, "r") as f:
+            with open(self.config.fanPath, "r") as f:
                 for line in f:
                     if ":" in line:
                         key, value = line.split(":", 1)
@@ -203,14 +263,14 @@ class ThinkFanUI(QApp_SysTrayIndicator):
                             fan_data["Fan1"] = f"{value.strip()} RPM"
 
         except FileNotFoundError:
-            fan_data["Error"] = f"{PROC_FAN} not found."
+            fan_data["Error"] = f"{self.config.fanPath} not found."
         except Exception as e:
             fan_data["Error"] = str(e)
 
         # 2. Get fan2 (and others) from 'sensors' command
         try:
-            proc = subprocess.Popen(["sensors", "thinkpad-isa-0000"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            sOut, sErr = proc.communicate(timeout=2)
+            proc = subprocess.Popen(["sensors", self.config.chip], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            sOut, sErr = proc.communicate(timeout=self.config.timeout)
             if not sErr:
                 lines = sOut.decode().strip().split("\n")
                 fanRE = re.compile(r"^(fan2.*?):\s*(\d+\s*RPM)")
@@ -228,18 +288,23 @@ class ThinkFanUI(QApp_SysTrayIndicator):
 
     def setFanSpeed(self, speed="auto", retry=False):
         """Sets the fan speed by writing to /proc/acpi/ibm/fan."""
+        self.fanLevel = speed
+        if self.suspended:
+            # will be applied on resume
+            return
+
         print("set speed:", speed)
         try:
-            with open(PROC_FAN, "w") as soc:
+            with open(self.config.fanPath, "w") as soc:
                 soc.write(f"level {speed}")
         except PermissionError:
-            updatePermissions()
+            updatePermissions(self.config.fanPath)
             if not retry:
                 self.setFanSpeed(speed, True)
             else:
                 self.mainWindow.showErrorMSG("Missing permissions! Failed to set fan speed.")
         except FileNotFoundError:
-            self.mainWindow.showErrorMSG(f"{PROC_FAN} does not exist!")
+            self.mainWindow.showErrorMSG(f"{self.config.fanPath} does not exist!")
         except OSError:
             self.mainWindow.showErrorMSG(
                 f"\"thinkpad_acpi\" does not seem to be set up correctly!",
@@ -295,11 +360,40 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def _set_fan_mode_manual(self):
         self.app.setFanSpeed(self.slider.value())
 
+    def showFanLevel(self, level: str):
+        """Reflects a level that was set from outside the window in the controls."""
+        if level == "auto":
+            self.button_auto.setChecked(True)
+        elif level == "full-speed":
+            self.button_full.setChecked(True)
+        elif str(level).isdigit():
+            self.button_set.setChecked(True)
+            # don't trigger _slider_value_changed, the level is already set
+            self.slider.blockSignals(True)
+            self.slider.setValue(int(level))
+            self.slider.blockSignals(False)
+            self.slider_value.setNum(int(level))
+        else:
+            # e.g. "disengaged", none of the buttons stands for it
+            self.fanModeGroup.setExclusive(False)
+            for button in self.fanModeGroup.buttons():
+                button.setChecked(False)
+            self.fanModeGroup.setExclusive(True)
+
     def _slider_value_changed(self, value):
         # Moving the slider automatically activates manual mode
         self.button_set.setChecked(True)
         self._set_fan_mode_manual()
 
+    def showEvent(self, event):
+        # also covers appear() and restoring a minimized window
+        super().showEvent(event)
+        self.app.startUpdates()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.app.stopUpdates()
+
     def closeEvent(self, event):
         if self.app.useIndicator:
             event.ignore()
@@ -347,20 +441,20 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
 # --- Helper Functions ---
 
-def updatePermissions():
+def updatePermissions(path: str):
     try:
-        command = ["pkexec", "chown", os.getlogin(), PROC_FAN]
+        command = ["pkexec", "chown", os.getlogin(), path]
         result = subprocess.run(command)
     except OSError:
-        command = ["pkexec", "chmod", "777", PROC_FAN]
+        command = ["pkexec", "chmod", "777", path]
         result = subprocess.run(command)
     print(f"Permission update exited with code: {result.returncode}")
 
-def checkPermissions() -> bool:
-    if not os.path.isfile(PROC_FAN):
+def checkPermissions(path: str) -> bool:
+    if not os.path.isfile(path):
         # we cannot change permissions of a file that does not exist
         return True
-    return os.access(PROC_FAN, os.W_OK)
+    return os.access(path, os.W_OK)
 
 def openGitHub():
     subprocess.Popen(["xdg-open", GITHUB_URL])